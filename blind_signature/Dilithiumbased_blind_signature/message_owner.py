@@ -14,17 +14,19 @@
 #
 # For true blind signatures, consider RSA-based schemes or research-level lattice approaches.
 
-import random
 import json
-from Crypto.Hash import SHA256
-from dilithium import Dilithium
+import os
+import secrets
+import msgpack
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
 
 class MessageOwner:
     def __init__(self, signer_public_key):
         self.signer_public_key = signer_public_key
-        # Use the same parameter set as the signer
-        from signer import DILITHIUM_PARAMS
-        self.dilithium = Dilithium(parameter_set=DILITHIUM_PARAMS)
+        # Use the same parameter set (and instance) as the signer
+        from signer import get_dilithium
+        self.dilithium = get_dilithium()
 
     def blind_message(self, message, r=None):
         """
@@ -36,20 +38,38 @@ class MessageOwner:
         if isinstance(message, str):
             message = message.encode()
         
-        h = SHA256.new(message)
-        m = h.digest()
-        
+        m = sha256(message).digest()
+        return self._blind_digest(message, m, r)
+
+    def blind_messages(self, messages):
+        """
+        Blind a batch of messages, each with its own fresh blinding factor.
+        All messages are hashed in one pass and all blinding factors come
+        from a single call to secrets.token_bytes before any blinding is done.
+        """
+        messages = [
+            message.encode() if isinstance(message, str) else message
+            for message in messages
+        ]
+        digests = [sha256(message).digest() for message in messages]
+        pad = secrets.token_bytes(32 * len(messages))
+        return [
+            self._blind_digest(message, m, pad[32 * i:32 * i + 32])
+            for i, (message, m) in enumerate(zip(messages, digests))
+        ]
+
+    def _blind_digest(self, message, m, r=None):
         if r is None:
-            r = random.randbytes(32)  # 256-bit random blinding factor
+            r = secrets.token_bytes(32)  # 256-bit random blinding factor
         
         # Simple concatenation - NOT a proper mathematical blinding
         blinded = m + r  # Concatenate hash with blinding factor
         
         return {
-            'blinded_msg': blinded.hex(),
-            'r': r.hex(),
-            'original_message': message.hex(),
-            'message_hash': m.hex()
+            'blinded_msg': blinded,
+            'r': r,
+            'original_message': message,
+            'message_hash': m
         }
 
     def unblind_signature(self, blinded_signature, r):
@@ -70,15 +90,24 @@ class MessageOwner:
         """
         if isinstance(original_message, str):
             original_message = original_message.encode()
+        
+        m = sha256(original_message).digest()
+        return self.verify_blind_signature_precomputed(m, signature, r)
+
+    def verify_blind_signature_precomputed(self, m_hash, signature, r):
+        """
+        Private verification against an already computed SHA256(message),
+        e.g. the message_hash returned by blind_message, skipping the re-hash.
+        """
+        if isinstance(m_hash, str):
+            m_hash = bytes.fromhex(m_hash)
         if isinstance(r, str):
             r = bytes.fromhex(r)
         if isinstance(signature, str):
             signature = bytes.fromhex(signature)
         
         # Reconstruct the blinded message (requires secret r)
-        h = SHA256.new(original_message)
-        m = h.digest()
-        blinded_message = m + r
+        blinded_message = m_hash + r
         
         # Verify against the blinded message, not the original
         try:
@@ -87,6 +116,23 @@ class MessageOwner:
             print(f"Verification error: {e}")
             return False
 
+    def verify_batch(self, items, workers=None):
+        """
+        Private verification of many (original_message, signature, r) items
+        in parallel worker processes. Returns one bool per item, in order.
+        """
+        items = list(items)
+        if not items:
+            return []
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(items) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_verify_worker,
+            initargs=(self.signer_public_key,),
+        ) as pool:
+            return list(pool.map(_verify_in_worker, items, chunksize=chunksize))
+
     def verify(self, message, signature):
         """
         Standard verification - will fail for our "blind" signatures
@@ -101,12 +147,24 @@ class MessageOwner:
             print(f"Verification error: {e}")
             return False
 
+# Per-process MessageOwner used by verify_batch workers, built once by the
+# pool initializer instead of being pickled with every task
+_worker_owner = None
+
+def _init_verify_worker(signer_public_key):
+    global _worker_owner
+    _worker_owner = MessageOwner(signer_public_key)
+
+def _verify_in_worker(item):
+    original_message, signature, r = item
+    return _worker_owner.verify_blind_signature(original_message, signature, r)
+
 def run_message_owner_phase1():
     # Load the signer's public key (should be provided by the signer)
     try:
         with open('signer_public_key.json', 'r') as f:
             key_data = json.load(f)
-            public_key = key_data['public_key']
+            public_key = bytes.fromhex(key_data['public_key'])
     except FileNotFoundError:
         print("Error: signer_public_key.json not found!")
         print("Please run 'python signer.py setup' first to generate signer keys.")
@@ -122,34 +180,35 @@ def run_message_owner_phase1():
     blind_data = owner.blind_message(original_message)
     
     print("\nBlinding complete. Results:")
-    print(f"Blinded message: {blind_data['blinded_msg']}")
-    print(f"Blinding factor r: {blind_data['r']} (secret)")
-    print(f"Original message: {blind_data['original_message']} (for reference)")
+    print(f"Blinded message: {blind_data['blinded_msg'].hex()}")
+    print(f"Blinding factor r: {blind_data['r'].hex()} (secret)")
+    print(f"Original message: {blind_data['original_message'].hex()} (for reference)")
     
-    # Save to file to pass to signer
-    with open('blind_data.json', 'w') as f:
-        json.dump({
+    # Save to file to pass to signer (raw bytes, no hex round trip)
+    with open('blind_data.msgpack', 'wb') as f:
+        f.write(msgpack.packb({
             'blinded_msg': blind_data['blinded_msg'],
             'public_key': public_key,
             '_secret_r': blind_data['r'],
-            '_original_message': blind_data['original_message']
-        }, f)
+            '_original_message': blind_data['original_message'],
+            '_message_hash': blind_data['message_hash']
+        }, use_bin_type=True))
     
-    print("\nSaved blind_data.json for signer to process")
+    print("\nSaved blind_data.msgpack for signer to process")
     print("Note: The blinding factor r is stored locally for phase 2")
 
 def run_message_owner_phase2():
     # Load original blind data
-    with open('blind_data.json', 'r') as f:
-        blind_data = json.load(f)
-        r = bytes.fromhex(blind_data['_secret_r'])
-        public_key = bytes.fromhex(blind_data['public_key'])
-        original_message_hex = blind_data['_original_message']
+    with open('blind_data.msgpack', 'rb') as f:
+        blind_data = msgpack.unpackb(f.read(), raw=False)
+        r = blind_data['_secret_r']
+        public_key = blind_data['public_key']
+        message_hash = blind_data['_message_hash']
     
     # Load the signature from signer
-    with open('blind_signature.json', 'r') as f:
-        signature_data = json.load(f)
-        blind_signature = bytes.fromhex(signature_data['blind_signature'])
+    with open('blind_signature.msgpack', 'rb') as f:
+        signature_data = msgpack.unpackb(f.read(), raw=False)
+        blind_signature = signature_data['blind_signature']
     
     owner = MessageOwner(public_key)
     
@@ -161,8 +220,7 @@ def run_message_owner_phase2():
     print(f"\nFinal signature: {final_signature.hex()}")
     
     # Verification
-    original_message = bytes.fromhex(original_message_hex)
-    is_valid = owner.verify_blind_signature(original_message, final_signature, r)
+    is_valid = owner.verify_blind_signature_precomputed(message_hash, final_signature, r)
     print("\nValidation results:")
     print(f"Signature is valid: {is_valid}")
 
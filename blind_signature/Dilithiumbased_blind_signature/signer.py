@@ -2,6 +2,9 @@
 
 import json
 import os
+import struct
+import sys
+import msgpack
 from dilithium import Dilithium
 
 # Complete parameter set for Dilithium2 - using correct parameter names
@@ -19,12 +22,23 @@ DILITHIUM_PARAMS = {
     "eta_bound": 15  # Fixed: using correct value from DEFAULT_PARAMETERS
 }
 
+_dilithium = None
+
+def get_dilithium():
+    """
+    Return the Dilithium instance for DILITHIUM_PARAMS shared by key generation,
+    every Signer and every MessageOwner. It is created on first use, so the
+    parameter setup is paid once per process.
+    """
+    global _dilithium
+    if _dilithium is None:
+        _dilithium = Dilithium(parameter_set=DILITHIUM_PARAMS)
+    return _dilithium
+
 def generate_dilithium_keys():
-    # Generate Dilithium key pair with default parameters
-    dilithium = Dilithium(parameter_set=DILITHIUM_PARAMS)
     # Generate a random key seed
     key_seed = os.urandom(32)  # 256-bit random seed
-    pk, sk = dilithium.keygen(key_seed)
+    pk, sk = get_dilithium().keygen(key_seed)
     return pk, sk
 
 def setup_signer_keys():
@@ -46,7 +60,7 @@ def setup_signer_keys():
 class Signer:
     def __init__(self, private_key):
         self.private_key = private_key
-        self.dilithium = Dilithium(parameter_set=DILITHIUM_PARAMS)
+        self.dilithium = get_dilithium()
 
     def sign_blinded(self, blinded_message):
         # Convert hex string back to bytes if needed
@@ -68,11 +82,11 @@ def run_signer():
     print("Using Dilithium keys")
     
     # Load the blinded message from file
-    with open('blind_data.json', 'r') as f:
-        data = json.load(f)
+    with open('blind_data.msgpack', 'rb') as f:
+        data = msgpack.unpackb(f.read(), raw=False)
         blinded_msg = data['blinded_msg']
     
-    print(f"\nReceived blinded message: {blinded_msg}")
+    print(f"\nReceived blinded message: {blinded_msg.hex()}")
     
     # Sign the blinded message
     signer = Signer(private_key)
@@ -80,14 +94,46 @@ def run_signer():
     print(f"\nCreated blind signature: {blind_signature.hex()}")
     
     # Save the blind signature
-    with open('blind_signature.json', 'w') as f:
-        json.dump({'blind_signature': blind_signature.hex()}, f)
+    with open('blind_signature.msgpack', 'wb') as f:
+        f.write(msgpack.packb({'blind_signature': blind_signature}, use_bin_type=True))
+    
+    print("\nSaved blind_signature.msgpack for message owner to process")
+
+def run_signer_daemon():
+    """
+    Long-lived signer: reads blinded messages from stdin and writes signatures
+    to stdout using a single Signer.
+    Each message and signature is framed as a 4-byte big-endian length
+    followed by the raw bytes. Stops at end of input.
+    """
+    with open('signer_private_key.json', 'r') as f:
+        key_data = json.load(f)
+        private_key = bytes.fromhex(key_data['private_key'])
     
-    print("\nSaved blind_signature.json for message owner to process")
+    signer = Signer(private_key)
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    # stdout carries signatures, so status goes to stderr
+    print("=== Signer Daemon: waiting for blinded messages on stdin ===", file=sys.stderr)
+    
+    while True:
+        header = stdin.read(4)
+        if len(header) < 4:
+            break
+        (length,) = struct.unpack('>I', header)
+        blinded_msg = stdin.read(length)
+        if len(blinded_msg) < length:
+            print("Error: truncated blinded message", file=sys.stderr)
+            break
+        
+        signature = signer.sign_blinded(blinded_msg)
+        stdout.write(struct.pack('>I', len(signature)) + signature)
+        stdout.flush()
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) > 1 and sys.argv[1] == "setup":
         setup_signer_keys()
+    elif len(sys.argv) > 1 and sys.argv[1] == "daemon":
+        run_signer_daemon()
     else:
         run_signer()
\ No newline at end of file
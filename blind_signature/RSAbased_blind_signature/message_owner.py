@@ -1,63 +1,109 @@
-import random
+import os
+import secrets
 import json
-from Crypto.Util.number import bytes_to_long, long_to_bytes
-from Crypto.Hash import SHA256
+from collections import deque
+from functools import lru_cache
+from hashlib import sha256
+import gmpy2
+
+# Set RSA_BLIND_DEBUG=1 to double-check that every random r is coprime with N
+_DEBUG_CHECKS = os.environ.get("RSA_BLIND_DEBUG") == "1"
+
+@lru_cache(maxsize=4096)
+def _verify_pow(signature, e, N):
+    # Re-verifying the same signature under the same key is a dict lookup
+    return gmpy2.powmod(signature, e, N)
 
 class MessageOwner:
-    def __init__(self, signer_public_key):
-        self.e, self.N = signer_public_key
+    def __init__(self, signer_public_key, pool_size=1):
+        e, N = signer_public_key
+        # Work in GMP integers throughout; results are converted back to int
+        # only when they leave the class
+        self.e = gmpy2.mpz(e)
+        self.N = gmpy2.mpz(N)
+        # Precomputed (r, r^e mod N, r^-1 mod N) triples, refilled on demand.
+        # A one-off blind only pays for one triple; callers blinding many
+        # messages on one instance can raise pool_size or use blind_messages
+        self._pool_size = pool_size
+        self._blind_pool = deque()
 
     def blind_message(self, message, r=None):
         if isinstance(message, str):
             message = message.encode()
         
-        h = SHA256.new(message)
-        m = bytes_to_long(h.digest())
-        
+        m = int.from_bytes(sha256(message).digest(), "big")
+        return self._blind_digest(m, r)
+
+    def blind_messages(self, messages):
+        # Hash the whole batch in one tight pass before any big-int work
+        digests = [
+            sha256(message.encode() if isinstance(message, str) else message).digest()
+            for message in messages
+        ]
+        missing = len(digests) - len(self._blind_pool)
+        if missing > 0:
+            self._refill_pool(missing)
+        return [self._blind_digest(int.from_bytes(digest, "big")) for digest in digests]
+
+    def _blind_digest(self, m, r=None):
         if r is None:
-            while True:
-                r = random.randint(2, self.N - 1)
-                if self._gcd(r, self.N) == 1:
-                    break
+            if not self._blind_pool:
+                self._refill_pool(max(1, self._pool_size))
+            r, r_e, r_inv = self._blind_pool.popleft()
+        else:
+            r_e = gmpy2.powmod(r, self.e, self.N)
+            r_inv = None
         
-        blinded = (m * pow(r, self.e, self.N)) % self.N
+        blinded = (gmpy2.mpz(m) * r_e) % self.N
         return {
-            'blinded_msg': blinded,
-            'r': r,
+            'blinded_msg': int(blinded),
+            'r': int(r),
+            # Pass to unblind_signature to skip the inverse; None for a caller-supplied r
+            'r_inv': int(r_inv) if r_inv is not None else None,
             'original_hash': m
         }
 
-    def unblind_signature(self, blinded_signature, r):
-        r_inv = self._modinv(r, self.N)
-        return (blinded_signature * r_inv) % self.N
+    def _refill_pool(self, n):
+        N = self.N
+        # For N = p*q a random r shares a factor with N with negligible
+        # probability, so no coprimality check is needed
+        rs = [gmpy2.mpz(secrets.randbelow(int(N) - 2) + 2) for _ in range(n)]
+        if _DEBUG_CHECKS:
+            assert all(gmpy2.gcd(r, N) == 1 for r in rs)
+
+        # Invert the whole batch with a single gmpy2.invert (Montgomery's trick)
+        prefix = []
+        acc = gmpy2.mpz(1)
+        for r in rs:
+            prefix.append(acc)
+            acc = (acc * r) % N
+        inv = gmpy2.invert(acc, N)
+        r_invs = [None] * n
+        for i in reversed(range(n)):
+            r_invs[i] = (inv * prefix[i]) % N
+            inv = (inv * rs[i]) % N
+
+        # e is fixed for the whole batch: raise every r to it in one GMP call
+        r_es = gmpy2.powmod_base_list(rs, self.e, N)
+        self._blind_pool.extend(zip(rs, r_es, r_invs))
+
+    def unblind_signature(self, blinded_signature, r, r_inv=None):
+        if r_inv is None:
+            try:
+                r_inv = gmpy2.invert(gmpy2.mpz(r), self.N)
+            except ZeroDivisionError:
+                raise ValueError("Modular inverse does not exist")
+        return int((gmpy2.mpz(blinded_signature) * r_inv) % self.N)
 
     def verify(self, message, signature):
         if isinstance(message, str):
             message = message.encode()
         
-        h = SHA256.new(message)
-        m = bytes_to_long(h.digest())
-        return pow(signature, self.e, self.N) == m % self.N
-
-    @staticmethod
-    def _gcd(a, b):
-        while b:
-            a, b = b, a % b
-        return a
-
-    @staticmethod
-    def _modinv(a, m):
-        g, x, y = MessageOwner._egcd(a, m)
-        if g != 1:
-            raise ValueError("Modular inverse does not exist")
-        return x % m
-
-    @staticmethod
-    def _egcd(a, b):
-        if a == 0:
-            return (b, 0, 1)
-        g, y, x = MessageOwner._egcd(b % a, a)
-        return (g, x - (b // a) * y, y)
+        m = int.from_bytes(sha256(message).digest(), "big")
+        # Coerce only real integers; mpz() would also parse strings and truncate floats
+        if not isinstance(signature, (int, gmpy2.mpz)):
+            raise TypeError(f"signature must be an integer, not {type(signature).__name__}")
+        return _verify_pow(gmpy2.mpz(signature), self.e, self.N) == m % self.N
 
 def run_message_owner_phase1():
     # Generate keys once and reuse them
@@ -84,6 +130,7 @@ def run_message_owner_phase1():
             'blinded_msg': blind_data['blinded_msg'],
             'public_key': public_key,
             '_secret_r': blind_data['r'],
+            '_secret_r_inv': blind_data['r_inv'],
             '_original_hash': blind_data['original_hash']
         }, f)
     
@@ -99,6 +146,7 @@ def run_message_owner_phase2():
     with open('blind_data.json', 'r') as f:
         blind_data = json.load(f)
         r = blind_data['_secret_r']
+        r_inv = blind_data['_secret_r_inv']
         public_key = blind_data['public_key']
     
     # Load the signature from signer
@@ -112,7 +160,7 @@ def run_message_owner_phase2():
     print(f"Received blind signature: {blind_signature}")
     
     # Unblind the signature
-    final_signature = owner.unblind_signature(blind_signature, r)
+    final_signature = owner.unblind_signature(blind_signature, r, r_inv)
     print(f"\nUnblinded signature: {final_signature}")
     
     # Verification
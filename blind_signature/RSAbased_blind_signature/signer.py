@@ -1,5 +1,6 @@
 import json
-from Crypto.Util.number import getPrime, inverse
+import gmpy2
+from Crypto.Util.number import getPrime
 
 def generate_rsa_keys(key_size=1024):
     e = 65537
@@ -7,15 +8,32 @@ def generate_rsa_keys(key_size=1024):
     q = getPrime(key_size // 2)
     N = p * q
     phi = (p - 1) * (q - 1)
-    d = inverse(e, phi)
-    return (e, N), (d, N)
+    d = int(gmpy2.invert(e, phi))
+    # CRT components let the signer work modulo p and q separately
+    dp = d % (p - 1)
+    dq = d % (q - 1)
+    qinv = int(gmpy2.invert(q, p))
+    return (e, N), (d, N, e, p, q, dp, dq, qinv)
 
 class Signer:
     def __init__(self, private_key):
-        self.d, self.N = private_key
+        # Keep the key as GMP integers so every signature reuses them directly
+        self.d, self.N, self.e, self.p, self.q, self.dp, self.dq, self.qinv = (
+            gmpy2.mpz(x) for x in private_key
+        )
 
     def sign_blinded(self, blinded_message):
-        return pow(blinded_message, self.d, self.N)
+        # Two half-width exponentiations recombined with Garner's formula
+        m = gmpy2.mpz(blinded_message)
+        s1 = gmpy2.powmod(m, self.dp, self.p)
+        s2 = gmpy2.powmod(m, self.dq, self.q)
+        h = ((s1 - s2) * self.qinv) % self.p
+        s = s2 + h * self.q
+        # A faulty CRT half would let gcd(s^e - m, N) reveal p, so never
+        # release an unchecked result; recompute with the full exponent instead
+        if gmpy2.powmod(s, self.e, self.N) != m % self.N:
+            s = gmpy2.powmod(m, self.d, self.N)
+        return int(s)
 
 def run_signer():
     print("\n=== Signer Process ===")